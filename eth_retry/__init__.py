@@ -1,3 +1,5 @@
+from eth_retry.bulk import bulk_map, bulk_map_async
 from eth_retry.eth_retry import auto_retry
+from eth_retry.ranges import auto_retry_range
 
-__all__ = ["auto_retry"]
+__all__ = ["auto_retry", "auto_retry_range", "bulk_map", "bulk_map_async"]
@@ -0,0 +1,243 @@
+import asyncio
+from asyncio import FIRST_COMPLETED as ASYNC_FIRST_COMPLETED
+from asyncio import Task, create_task, get_running_loop
+from asyncio import wait as asyncwait
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as futureswait
+from threading import Lock
+from types import TracebackType
+from typing import Any, TypeVar
+
+from eth_retry import eth_retry as core
+
+# Types
+__I = TypeVar("__I")
+__T = TypeVar("__T")
+
+
+class _BackoffTracker:
+    """Counts the items currently sleeping between retries. Safe to share between threads."""
+
+    def __init__(self) -> None:
+        self.backing_off = 0
+        # Resolved, and replaced, whenever an item stops backing off.
+        self.woke: Future[None] = Future()
+        self._lock = Lock()
+
+    def __enter__(self) -> None:
+        with self._lock:
+            self.backing_off += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        with self._lock:
+            self.backing_off -= 1
+            woke, self.woke = self.woke, Future()
+        woke.set_result(None)
+
+
+class _AsyncBackoffTracker:
+    """Counts the items currently sleeping between retries, on a single event loop."""
+
+    def __init__(self) -> None:
+        self.backing_off = 0
+        # Resolved, and replaced, whenever an item stops backing off.
+        self.woke: asyncio.Future[None] = get_running_loop().create_future()
+
+    def __enter__(self) -> None:
+        self.backing_off += 1
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.backing_off -= 1
+        woke, self.woke = self.woke, get_running_loop().create_future()
+        woke.set_result(None)
+
+
+def bulk_map(
+    func: Callable[[__I], __T],
+    items: Iterable[__I],
+    *,
+    max_workers: int = 32,
+    ordered: bool = True,
+) -> Iterator[tuple[__I, __T | Exception]]:
+    """
+    Apply `func`, ideally decorated with :func:`auto_retry`, to each of `items` on a thread
+    pool, and yield `(item, result)` pairs as they become available.
+
+    Each item retries independently under `func`'s own policy. If an item still fails, its
+    `result` is the exception it raised, and the rest of the batch carries on.
+
+    At most `max_workers` items are in flight at once, one fewer for each in-flight item that
+    is sleeping between retries, so a struggling endpoint isn't flooded.
+
+    Results are yielded in the order of `items` by default, or as they complete if
+    `ordered` is False. In order, results that complete ahead of a slower item are held back
+    until it finishes, while the pool keeps working on the items after it.
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise TypeError(f"'max_workers' must be a positive integer, not {max_workers}")
+    return _bulk_map(func, iter(items), max_workers, ordered)
+
+
+def _bulk_map(
+    func: Callable[[__I], __T], items: Iterator[__I], max_workers: int, ordered: bool
+) -> Iterator[tuple[__I, __T | Exception]]:
+    tracker = _BackoffTracker()
+    backoff_tracker = core.backoff_tracker
+
+    def run(item: __I) -> __T:
+        token = backoff_tracker.set(tracker)
+        try:
+            return func(item)
+        finally:
+            backoff_tracker.reset(token)
+
+    def result(item: __I, future: Future[__T]) -> tuple[__I, __T | Exception]:
+        e = future.exception()
+        if e is None:
+            return item, future.result()
+        if not isinstance(e, Exception):
+            raise e
+        return item, e
+
+    executor = ThreadPoolExecutor(max_workers)
+    # Submitted and not yet yielded.
+    pending: dict[Future[__T], __I] = {}
+    # Submitted and not yet done.
+    running: set[Future[__T]] = set()
+    queue: deque[Future[__T]] = deque()
+
+    def submit() -> bool:
+        for item in items:
+            future = executor.submit(run, item)
+            pending[future] = item
+            running.add(future)
+            if ordered:
+                queue.append(future)
+            return True
+        return False
+
+    try:
+        while True:
+            woke = tracker.woke
+            # Each item backing off takes one more slot away from new items, so submissions
+            # slow down while the endpoint struggles without stopping the rest of the batch.
+            while len(running) < max_workers - tracker.backing_off and submit():
+                pass
+            if not pending:
+                return
+            waiting: list[Future[Any]] = [woke, *running]
+            done, _ = futureswait(waiting, return_when=FIRST_COMPLETED)
+            running.difference_update(done)
+            if ordered:
+                while queue and queue[0].done():
+                    future = queue.popleft()
+                    running.discard(future)
+                    yield result(pending.pop(future), future)
+            else:
+                for future in done:
+                    if future is not woke:
+                        yield result(pending.pop(future), future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def bulk_map_async(
+    func: Callable[[__I], Coroutine[Any, Any, __T]],
+    items: Iterable[__I],
+    *,
+    concurrency: int = 32,
+    ordered: bool = True,
+) -> AsyncIterator[tuple[__I, __T | Exception]]:
+    """
+    Await `func`, ideally decorated with :func:`auto_retry`, for each of `items` with at most
+    `concurrency` calls in flight, and yield `(item, result)` pairs as they become available.
+
+    Each item retries independently under `func`'s own policy. If an item still fails, its
+    `result` is the exception it raised, and the rest of the batch carries on.
+
+    The limit is one lower for each in-flight item that is sleeping between retries, so a
+    struggling endpoint isn't flooded.
+
+    Results are yielded in the order of `items` by default, or as they complete if
+    `ordered` is False. In order, results that complete ahead of a slower item are held back
+    until it finishes, while later items keep running.
+    """
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise TypeError(f"'concurrency' must be a positive integer, not {concurrency}")
+    return _bulk_map_async(func, iter(items), concurrency, ordered)
+
+
+async def _bulk_map_async(
+    func: Callable[[__I], Coroutine[Any, Any, __T]],
+    items: Iterator[__I],
+    concurrency: int,
+    ordered: bool,
+) -> AsyncIterator[tuple[__I, __T | Exception]]:
+    tracker = _AsyncBackoffTracker()
+    backoff_tracker = core.backoff_tracker
+
+    async def run(item: __I) -> tuple[__I, __T | Exception]:
+        # Tasks run in a copy of the current context, so this only affects this item.
+        backoff_tracker.set(tracker)
+        try:
+            return item, await func(item)
+        except Exception as e:
+            return item, e
+
+    # Started and not yet yielded.
+    pending: set[Task[tuple[__I, __T | Exception]]] = set()
+    # Started and not yet done.
+    running: set[Task[tuple[__I, __T | Exception]]] = set()
+    queue: deque[Task[tuple[__I, __T | Exception]]] = deque()
+
+    def submit() -> bool:
+        for item in items:
+            task = create_task(run(item))
+            pending.add(task)
+            running.add(task)
+            if ordered:
+                queue.append(task)
+            return True
+        return False
+
+    try:
+        while True:
+            woke = tracker.woke
+            # Each item backing off takes one more slot away from new items, so submissions
+            # slow down while the endpoint struggles without stopping the rest of the batch.
+            while len(running) < concurrency - tracker.backing_off and submit():
+                pass
+            if not pending:
+                return
+            waiting: set[asyncio.Future[Any]] = {woke, *running}
+            done, _ = await asyncwait(waiting, return_when=ASYNC_FIRST_COMPLETED)
+            running.difference_update(done)
+            if ordered:
+                while queue and queue[0].done():
+                    task = queue.popleft()
+                    pending.discard(task)
+                    running.discard(task)
+                    yield task.result()
+            else:
+                for future in done:
+                    if future is not woke:
+                        pending.discard(future)
+                        yield future.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+__all__ = ["bulk_map", "bulk_map_async"]
@@ -1,31 +1,36 @@
 # type: ignore
+# NOTE: these are resolved on first attribute access so that importing eth_retry never imports
+# the http libraries. `should_retry` matches exception types by name and doesn't use them.
+
+from importlib import import_module
 
 
 class DummyException(Exception):
     pass
 
 
-# eth-brownie
-try:
-    from sqlite3 import OperationalError
-except ModuleNotFoundError:
-    OperationalError = DummyException
-
-# web3py
-try:
-    from requests.exceptions import HTTPError, ReadTimeout
-except ModuleNotFoundError:
-    HTTPError, ReadTimeout = DummyException, DummyException
+_locations = {
+    # eth-brownie
+    "OperationalError": ("sqlite3", "OperationalError"),
+    # web3py
+    "HTTPError": ("requests.exceptions", "HTTPError"),
+    "ReadTimeout": ("requests.exceptions", "ReadTimeout"),
+    # aiohttp
+    "ClientError": ("aiohttp", "ClientError"),
+    "ClientResponseError": ("aiohttp", "ClientResponseError"),
+    # urllib
+    "MaxRetryError": ("urllib3.exceptions", "MaxRetryError"),
+}
 
-# aiohttp
-try:
-    from aiohttp import ClientError
-    from aiohttp import ClientResponseError
-except ModuleNotFoundError:
-    ClientError, ClientResponseError = DummyException, DummyException
 
-# urllib
-try:
-    from urllib3.exceptions import MaxRetryError
-except ModuleNotFoundError:
-    MaxRetryError = DummyException
+def __getattr__(name):
+    try:
+        module, attr = _locations[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    try:
+        value = getattr(import_module(module), attr)
+    except ModuleNotFoundError:
+        value = DummyException
+    globals()[name] = value
+    return value
@@ -2,6 +2,8 @@ from asyncio import TimeoutError as AsyncioTimeoutError
 from asyncio import iscoroutinefunction
 from asyncio import sleep as aiosleep
 from collections.abc import Callable, Coroutine
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar
 from functools import partial, wraps
 from inspect import isasyncgenfunction, stack
 from json import JSONDecodeError
@@ -9,16 +11,10 @@ from logging import getLogger
 from random import randrange
 from time import sleep as timesleep
 from typing import Any, Final, ParamSpec, TypeVar, overload
-
-import requests
+from weakref import WeakKeyDictionary
 
 from eth_retry import ENVIRONMENT_VARIABLES as ENVS
-from eth_retry.conditional_imports import ClientError  # type: ignore
-from eth_retry.conditional_imports import ClientResponseError  # type: ignore
-from eth_retry.conditional_imports import HTTPError  # type: ignore
-from eth_retry.conditional_imports import MaxRetryError  # type: ignore
-from eth_retry.conditional_imports import OperationalError  # type: ignore
-from eth_retry.conditional_imports import ReadTimeout  # type: ignore
+from eth_retry import conditional_imports
 
 logger = getLogger("eth_retry")
 
@@ -39,6 +35,14 @@ SUPPRESS_LOGS: Final = int(ENVS.ETH_RETRY_SUPPRESS_LOGS)
 DEBUG_MODE: Final = bool(ENVS.ETH_RETRY_DEBUG)
 
 
+# Entered around every backoff sleep, so bulk helpers (see `eth_retry.bulk`) can tell when the
+# items they submitted are backing off.
+backoff_tracker: Final[ContextVar[AbstractContextManager[Any] | None]] = ContextVar(
+    "eth_retry_backoff_tracker", default=None
+)
+_no_tracker: Final = nullcontext()
+
+
 # logger methods
 log_info: Final = logger.info
 log_warning: Final = logger.warning
@@ -119,41 +123,26 @@ def auto_retry(
             suppress_logs=suppress_logs,
         )
 
+    if ETH_RETRY_DISABLED:
+        # Nothing would ever be retried, so don't wrap at all.
+        return func
+
     # define wrapper
+    # NOTE: the wrappers only hold the success path, the retry loop lives in
+    # `_retry` and `_retry_async` so the common case pays as little as possible.
     if iscoroutinefunction(func):
 
         @wraps(func)
         async def auto_retry_wrap_async(*args: __P.args, **kwargs: __P.kwargs) -> __T:
-            failures = 0
-            while True:
-                try:
-                    return await func(*args, **kwargs)  # type: ignore
-                except AsyncioTimeoutError as e:
-                    if not should_retry(e, failures, max_retries):
-                        raise
-                    log_warning(
-                        "asyncio timeout [%s] %s",
-                        failures,
-                        _get_caller_details_from_stack(),
-                    )
-                    if DEBUG_MODE:
-                        log_exception(e)
-                    failures += 1
-                    continue
-                except Exception as e:
-                    if not should_retry(e, failures, max_retries):
-                        raise
-                    if failures > suppress_logs:
-                        log_warning("%s [%s]", str(e), failures)
-                    if DEBUG_MODE:
-                        log_exception(e)
-
-                # Attempt failed, sleep time.
-                failures += 1
-                sleep_time = randrange(min_sleep_time, max_sleep_time)
-                if DEBUG_MODE:
-                    log_info("sleeping %s seconds.", round(failures * sleep_time, 2))
-                await aiosleep(failures * sleep_time)
+            try:
+                return await func(*args, **kwargs)  # type: ignore [no-any-return]
+            except Exception as e:
+                if not should_retry(e, 0, max_retries):
+                    raise
+                exc = e
+            return await _retry_async(
+                func, exc, args, kwargs, max_retries, min_sleep_time, max_sleep_time, suppress_logs
+            )
 
         return auto_retry_wrap_async  # type: ignore [return-value]
 
@@ -161,87 +150,180 @@ def auto_retry(
 
         @wraps(func)
         def auto_retry_wrap(*args: __P.args, **kwargs: __P.kwargs) -> __T:
-            failures = 0
-            while True:
-                # Attempt to execute `func` and return response
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if not should_retry(e, failures, max_retries):
-                        raise
-                    if failures > suppress_logs:
-                        log_warning("%s [%s]", str(e), failures)
-                    if DEBUG_MODE:
-                        log_exception(e)
-
-                # Attempt failed, sleep time.
-                failures += 1
-                sleep_time = randrange(min_sleep_time, max_sleep_time)
-                if DEBUG_MODE:
-                    log_info("sleeping %s seconds.", round(failures * sleep_time, 2))
-                timesleep(failures * sleep_time)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not should_retry(e, 0, max_retries):
+                    raise
+                exc = e
+            return _retry(
+                func, exc, args, kwargs, max_retries, min_sleep_time, max_sleep_time, suppress_logs
+            )
 
         return auto_retry_wrap
 
 
+def _retry(
+    func: Callable[..., __T],
+    e: Exception,
+    args: Any,
+    kwargs: Any,
+    max_retries: int,
+    min_sleep_time: int,
+    max_sleep_time: int,
+    suppress_logs: int,
+) -> __T:
+    # `e` has already been through `should_retry`
+    failures = 0
+    while True:
+        if failures > suppress_logs:
+            log_warning("%s [%s]", str(e), failures)
+        if DEBUG_MODE:
+            log_exception(e, exc_info=e)
+
+        # Attempt failed, sleep time.
+        failures += 1
+        sleep_time = randrange(min_sleep_time, max_sleep_time)
+        if DEBUG_MODE:
+            log_info("sleeping %s seconds.", round(failures * sleep_time, 2))
+        with backoff_tracker.get() or _no_tracker:
+            timesleep(failures * sleep_time)
+
+        # Attempt to execute `func` and return response
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if not should_retry(exc, failures, max_retries):
+                raise
+            e = exc
+
+
+async def _retry_async(
+    func: Callable[..., Coroutine[Any, Any, __T]],
+    e: Exception,
+    args: Any,
+    kwargs: Any,
+    max_retries: int,
+    min_sleep_time: int,
+    max_sleep_time: int,
+    suppress_logs: int,
+) -> __T:
+    # `e` has already been through `should_retry`
+    failures = 0
+    while True:
+        if isinstance(e, AsyncioTimeoutError):
+            log_warning(
+                "asyncio timeout [%s] %s",
+                failures,
+                _get_caller_details_from_stack(3),
+            )
+            if DEBUG_MODE:
+                log_exception(e, exc_info=e)
+            failures += 1
+        else:
+            if failures > suppress_logs:
+                log_warning("%s [%s]", str(e), failures)
+            if DEBUG_MODE:
+                log_exception(e, exc_info=e)
+
+            # Attempt failed, sleep time.
+            failures += 1
+            sleep_time = randrange(min_sleep_time, max_sleep_time)
+            if DEBUG_MODE:
+                log_info("sleeping %s seconds.", round(failures * sleep_time, 2))
+            with backoff_tracker.get() or _no_tracker:
+                await aiosleep(failures * sleep_time)
+
+        try:
+            return await func(*args, **kwargs)
+        except Exception as exc:
+            if not should_retry(exc, failures, max_retries):
+                raise
+            e = exc
+
+
+# Known transient error messages, matched case-insensitively against `str(e)`.
+RETRY_ON_ERRS: Final = (
+    # Occurs on any chain when making computationally intensive calls. Just retry.
+    # Sometimes works, sometimes doesn't. Worth a shot.
+    "execution aborted (timeout = 5s)",
+    "execution aborted (timeout = 10s)",
+    "max retries exceeded with url",
+    "temporary failure in name resolution",
+    "parse error",
+    # From block explorer while interacting with api. Just retry.
+    "max rate limit reached",
+    "max calls per sec rate limit reached",  # basescan, maybe others
+    "please use api key for higher rate limit",
+    # This one comes from optiscan specifically when you have no key
+    "too many invalid api key attempts, please try again later",
+    # Occurs occasionally on AVAX when node is slow to sync. Just retry.
+    "after last accepted block",
+    # The standard Moralis rate limiting message. Just retry.
+    "too many requests",
+    # You get this ssl error in docker sometimes
+    "cannot assign requested address",
+    # alchemy.io rate limiting
+    "your app has exceeded its compute units per second capacity. if you have retries enabled, you can safely ignore this message. if not, check out https://docs.alchemy.com/reference/throughput",
+    # quicknode.com rate limiting
+    "request limit reached - reduce calls per second or upgrade your account at quicknode.com",
+)
+
+
+# Exception types from optional dependencies are matched by the fully qualified names in the
+# exception's MRO, so that eth_retry never has to import the libraries that define them.
+_HTTP_ERROR: Final = "requests.exceptions.HTTPError"
+_CLIENT_RESPONSE_ERROR: Final = "aiohttp.client_exceptions.ClientResponseError"
+_OPERATIONAL_ERROR: Final = "sqlite3.OperationalError"
+
+_general_exceptions: Final = (ConnectionError, AsyncioTimeoutError, JSONDecodeError)
+_general_exception_names: Final = frozenset(
+    (
+        "requests.exceptions.ConnectionError",
+        _HTTP_ERROR,
+        "requests.exceptions.ReadTimeout",
+        "urllib3.exceptions.MaxRetryError",
+        "aiohttp.client_exceptions.ClientError",
+    )
+)
+
+# Weak keys, so that dynamically created exception types can still be freed.
+_mro_names: Final[WeakKeyDictionary[type, frozenset[str]]] = WeakKeyDictionary()
+
+
+def _get_mro_names(typ: type) -> frozenset[str]:
+    names = _mro_names.get(typ)
+    if names is None:
+        names = _mro_names[typ] = frozenset(f"{t.__module__}.{t.__qualname__}" for t in typ.__mro__)
+    return names
+
+
 def should_retry(e: Exception, failures: int, max_retries: int) -> bool:
     if ETH_RETRY_DISABLED or failures > max_retries:
         return False
 
     stre = str(e)
 
-    retry_on_errs = (
-        # Occurs on any chain when making computationally intensive calls. Just retry.
-        # Sometimes works, sometimes doesn't. Worth a shot.
-        "execution aborted (timeout = 5s)",
-        "execution aborted (timeout = 10s)",
-        "max retries exceeded with url",
-        "temporary failure in name resolution",
-        "parse error",
-        # From block explorer while interacting with api. Just retry.
-        "max rate limit reached",
-        "max calls per sec rate limit reached",  # basescan, maybe others
-        "please use api key for higher rate limit",
-        # This one comes from optiscan specifically when you have no key
-        "too many invalid api key attempts, please try again later",
-        # Occurs occasionally on AVAX when node is slow to sync. Just retry.
-        "after last accepted block",
-        # The standard Moralis rate limiting message. Just retry.
-        "too many requests",
-        # You get this ssl error in docker sometimes
-        "cannot assign requested address",
-        # alchemy.io rate limiting
-        "your app has exceeded its compute units per second capacity. if you have retries enabled, you can safely ignore this message. if not, check out https://docs.alchemy.com/reference/throughput",
-        # quicknode.com rate limiting
-        "request limit reached - reduce calls per second or upgrade your account at quicknode.com",
-    )
-    if any(filter(stre.lower().__contains__, retry_on_errs)):  # type: ignore [arg-type]
+    if any(filter(stre.lower().__contains__, RETRY_ON_ERRS)):  # type: ignore [arg-type]
         return True
 
-    if isinstance(e, HTTPError) and e.response is not None and e.response.status_code == 403:
-        return False
-    if isinstance(e, ClientResponseError) and e.status == 403:
-        return False
+    names = _get_mro_names(type(e))
 
-    general_exceptions = (
-        ConnectionError,
-        requests.exceptions.ConnectionError,
-        HTTPError,
-        ReadTimeout,
-        AsyncioTimeoutError,
-        MaxRetryError,
-        JSONDecodeError,
-        ClientError,
-    )
+    if _HTTP_ERROR in names:
+        response = getattr(e, "response", None)
+        if response is not None and response.status_code == 403:
+            return False
+    if _CLIENT_RESPONSE_ERROR in names and getattr(e, "status", None) == 403:
+        return False
 
     if (
-        any(isinstance(e, E) for E in general_exceptions)
+        (isinstance(e, _general_exceptions) or not names.isdisjoint(_general_exception_names))
         and "Too Large" not in stre
         and "404" not in stre
     ):
         return True
     # This happens when brownie's deployments.db gets locked. Just retry.
-    elif isinstance(e, OperationalError) and "database is locked" in stre:
+    elif _OPERATIONAL_ERROR in names and "database is locked" in stre:
         return True
 
     return False
@@ -250,8 +332,8 @@ def should_retry(e: Exception, failures: int, max_retries: int) -> bool:
 _aio_files: Final = "asyncio/events.py", "asyncio/base_events.py"
 
 
-def _get_caller_details_from_stack() -> str | None:
-    for frame in stack()[2:]:
+def _get_caller_details_from_stack(skip: int = 2) -> str | None:
+    for frame in stack()[skip:]:
         if all(filename not in frame.filename for filename in _aio_files):
             details = f"{frame.filename} line {frame.lineno}"
             context = frame.code_context
@@ -259,4 +341,9 @@ def _get_caller_details_from_stack() -> str | None:
     return None
 
 
+def __getattr__(name: str) -> Any:
+    # The optional exception types used to be imported here, keep them accessible.
+    return getattr(conditional_imports, name)
+
+
 __all__ = ["auto_retry"]
@@ -0,0 +1,329 @@
+from asyncio import FIRST_COMPLETED as ASYNC_FIRST_COMPLETED
+from asyncio import Semaphore, Task, create_task, iscoroutinefunction
+from asyncio import TimeoutError as AsyncioTimeoutError
+from asyncio import wait as asyncwait
+from collections.abc import Callable, Coroutine
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as futureswait
+from functools import partial, wraps
+from threading import Lock
+from typing import Any, Concatenate, Final, Generic, ParamSpec, TypeVar, overload
+
+from eth_retry.eth_retry import (
+    DEBUG_MODE,
+    MAX_RETRIES,
+    MAX_SLEEP_TIME,
+    MIN_SLEEP_TIME,
+    SUPPRESS_LOGS,
+    _get_mro_names,
+    auto_retry,
+    log_info,
+)
+
+# Types
+__T = TypeVar("__T")
+__P = ParamSpec("__P")
+# NOTE: names starting with __ get mangled inside class bodies
+_T = TypeVar("_T")
+
+RangeFunction = Callable[Concatenate[int, int, __P], list[__T]]
+AsyncRangeFunction = Callable[Concatenate[int, int, __P], Coroutine[Any, Any, list[__T]]]
+RangeDecorator = Callable[[RangeFunction[__P, __T]], RangeFunction[__P, __T]]
+
+_Range = tuple[int, int]
+
+
+# Errors that mean the block range asked for is too big to serve in one response. Retrying the
+# same range will likely fail again, so the range is split instead.
+SPLIT_ON_ERRS: Final = (
+    # Geth, Erigon and most providers when the call runs past the node's deadline
+    "execution aborted (timeout",
+    "query timeout exceeded",
+    # Response size limits
+    "too large",
+    "response size exceeded",
+    "response size should not greater than",
+    # Result count limits, ie. infura and alchemy
+    "query returned more than",
+    "log response size exceeded",
+    # Block range limits
+    "block range is too wide",
+    "exceed maximum block range",
+    "block range too large",
+    "range is too large",
+)
+
+_timeout_names: Final = frozenset(("requests.exceptions.ReadTimeout",))
+
+
+def should_split(e: Exception) -> bool:
+    """Return True if `e` indicates that the requested block range should be made smaller."""
+    if _is_timeout(e):
+        return True
+    stre = str(e).lower()
+    return any(filter(stre.__contains__, SPLIT_ON_ERRS))  # type: ignore [arg-type]
+
+
+def _is_timeout(e: Exception) -> bool:
+    return isinstance(e, AsyncioTimeoutError) or not _get_mro_names(type(e)).isdisjoint(
+        _timeout_names
+    )
+
+
+def _get_chunks(from_block: int, to_block: int, size: int) -> list[_Range]:
+    return [
+        (start, min(start + size - 1, to_block)) for start in range(from_block, to_block + 1, size)
+    ]
+
+
+class _SplitRange(Exception):
+    # NOTE: the message must not match anything `should_retry` retries, so that
+    # `auto_retry` hands it straight back to us instead of retrying the same range.
+    def __init__(self, error: Exception) -> None:
+        super().__init__("block range must be split")
+        self.error = error
+
+
+class _ChunkSize:
+    """The chunk size calls start with, learned from the calls before. Shared by all calls."""
+
+    def __init__(self, size: int | None) -> None:
+        self.size = size
+        # A `chunk_size` passed by the caller is never exceeded.
+        self.max_size = size
+        # The smallest chunk size that has failed with an error about the size of the response.
+        self.failed_size: int | None = None
+        self._lock = Lock()
+
+    def update(self, call: "_RangeCall[Any]") -> None:
+        with self._lock:
+            if call.split_ranges:
+                # Only errors about the size of the response say anything about the range
+                # size that works. A generic timeout may well be a network blip.
+                if call.failed_size and call.split_size:
+                    self.size = call.split_size
+                    self.failed_size = min(self.failed_size or call.failed_size, call.failed_size)
+            elif self.size is not None and self.size < call.range_size:
+                # Every chunk succeeded, try bigger chunks next time, but stay clear of the
+                # sizes known not to work.
+                size = self.size * 2
+                if self.max_size is not None:
+                    size = min(size, self.max_size)
+                if self.failed_size is not None:
+                    size = min(size, (self.size + self.failed_size) // 2)
+                self.size = max(self.size, size)
+
+
+class _RangeCall(Generic[_T]):
+    """Tracks the chunks of a single call to a function decorated with `auto_retry_range`."""
+
+    def __init__(self, chunk_size: _ChunkSize, from_block: int, to_block: int) -> None:
+        self.range_size = to_block - from_block + 1
+        self.chunks = _get_chunks(from_block, to_block, chunk_size.size or self.range_size)
+        self.results: dict[int, list[_T]] = {}
+        # The chunks that were split off from a chunk that failed.
+        self.split_ranges: set[_Range] = set()
+        # The largest of `split_ranges` that succeeded.
+        self.split_size = 0
+        # The smallest chunk that failed with an error about the size of the response.
+        self.failed_size: int | None = None
+
+    def succeeded(self, chunk: _Range, result: list[_T]) -> None:
+        self.results[chunk[0]] = result
+        if chunk in self.split_ranges:
+            self.split_size = max(self.split_size, chunk[1] - chunk[0] + 1)
+
+    def split(self, chunk: _Range, e: _SplitRange) -> list[_Range]:
+        from_block, to_block = chunk
+        if not _is_timeout(e.error):
+            size = to_block - from_block + 1
+            self.failed_size = min(self.failed_size or size, size)
+        if DEBUG_MODE:
+            log_info("%s, splitting blocks %s-%s", e.error, from_block, to_block)
+        halves = _get_chunks(from_block, to_block, (to_block - from_block + 2) // 2)
+        self.split_ranges.update(halves)
+        return halves
+
+    def get_results(self) -> list[_T]:
+        return [item for start in sorted(self.results) for item in self.results[start]]
+
+
+@overload
+def auto_retry_range(
+    func: None = None,
+    *,
+    max_concurrency: int = 8,
+    chunk_size: int | None = None,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> RangeDecorator: ...  # type: ignore [type-arg]
+@overload
+def auto_retry_range(
+    func: AsyncRangeFunction[__P, __T],
+    *,
+    max_concurrency: int = 8,
+    chunk_size: int | None = None,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> AsyncRangeFunction[__P, __T]: ...
+@overload
+def auto_retry_range(
+    func: RangeFunction[__P, __T],
+    *,
+    max_concurrency: int = 8,
+    chunk_size: int | None = None,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> RangeFunction[__P, __T]: ...
+def auto_retry_range(
+    func: RangeFunction[__P, __T] | AsyncRangeFunction[__P, __T] | None = None,
+    *,
+    max_concurrency: int = 8,
+    chunk_size: int | None = None,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> Any:
+    """
+    Decorator for functions that fetch a list of results, ie. logs, for the inclusive block
+    range `(from_block, to_block)` passed as their first two arguments.
+
+    Transient errors are retried just like :func:`auto_retry`. Errors that mean the range is
+    too large or too slow to serve (see :func:`should_split`) bisect the range instead, and the
+    sub-ranges are fetched concurrently, at most `max_concurrency` at a time. The results are
+    concatenated in block order.
+
+    A single block is never split, errors fetching one are retried like any other call. An
+    empty range (`from_block > to_block`) returns `[]` without calling the function.
+
+    When a response was too large, the largest split-off chunk size that succeeded is
+    remembered, so later calls start with chunks of that size rather than rediscovering it.
+    After a call where every chunk succeeded, the remembered size grows again, up to twice its
+    size but never to a size that has already been too large. Pass `chunk_size` to set the
+    starting size up front; it is also the largest size used.
+    """
+
+    # validate params
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise TypeError(f"'max_concurrency' must be a positive integer, not {max_concurrency}")
+    if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size < 1):
+        raise TypeError(f"'chunk_size' must be a positive integer or None, not {chunk_size}")
+
+    if func is None:
+        return partial(
+            auto_retry_range,
+            max_concurrency=max_concurrency,
+            chunk_size=chunk_size,
+            max_retries=max_retries,
+            min_sleep_time=min_sleep_time,
+            max_sleep_time=max_sleep_time,
+            suppress_logs=suppress_logs,
+        )
+
+    retry = auto_retry(
+        max_retries=max_retries,
+        min_sleep_time=min_sleep_time,
+        max_sleep_time=max_sleep_time,
+        suppress_logs=suppress_logs,
+    )
+    known_chunk_size = _ChunkSize(chunk_size)
+
+    # define wrapper
+    if iscoroutinefunction(func):
+
+        @retry
+        async def fetch_async(from_block: int, to_block: int, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(from_block, to_block, *args, **kwargs)
+            except Exception as e:
+                # A single block can't be split, so it's retried like any other call.
+                if from_block != to_block and should_split(e):
+                    raise _SplitRange(e) from e
+                raise
+
+        @wraps(func)
+        async def auto_retry_range_wrap_async(
+            from_block: int, to_block: int, *args: __P.args, **kwargs: __P.kwargs
+        ) -> list[__T]:
+            if from_block > to_block:
+                return []
+            call: _RangeCall[__T] = _RangeCall(known_chunk_size, from_block, to_block)
+            semaphore = Semaphore(max_concurrency)
+
+            async def fetch(chunk: _Range) -> list[__T]:
+                async with semaphore:
+                    return await fetch_async(*chunk, *args, **kwargs)  # type: ignore [no-any-return]
+
+            pending: dict[Task[list[__T]], _Range] = {
+                create_task(fetch(chunk)): chunk for chunk in call.chunks
+            }
+            try:
+                while pending:
+                    done, _ = await asyncwait(pending, return_when=ASYNC_FIRST_COMPLETED)
+                    for task in done:
+                        chunk = pending.pop(task)
+                        try:
+                            call.succeeded(chunk, task.result())
+                        except _SplitRange as e:
+                            for sub in call.split(chunk, e):
+                                pending[create_task(fetch(sub))] = sub
+            finally:
+                for task in pending:
+                    task.cancel()
+            known_chunk_size.update(call)
+            return call.get_results()
+
+        return auto_retry_range_wrap_async
+
+    else:
+
+        @retry
+        def fetch_sync(from_block: int, to_block: int, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return func(from_block, to_block, *args, **kwargs)
+            except Exception as e:
+                # A single block can't be split, so it's retried like any other call.
+                if from_block != to_block and should_split(e):
+                    raise _SplitRange(e) from e
+                raise
+
+        @wraps(func)
+        def auto_retry_range_wrap(
+            from_block: int, to_block: int, *args: __P.args, **kwargs: __P.kwargs
+        ) -> list[__T]:
+            if from_block > to_block:
+                return []
+            call: _RangeCall[__T] = _RangeCall(known_chunk_size, from_block, to_block)
+            with ThreadPoolExecutor(max_concurrency) as executor:
+
+                def submit(chunk: _Range) -> Future[list[__T]]:
+                    return executor.submit(fetch_sync, *chunk, *args, **kwargs)
+
+                pending = {submit(chunk): chunk for chunk in call.chunks}
+                try:
+                    while pending:
+                        done, _ = futureswait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            chunk = pending.pop(future)
+                            try:
+                                call.succeeded(chunk, future.result())
+                            except _SplitRange as e:
+                                for sub in call.split(chunk, e):
+                                    pending[submit(sub)] = sub
+                finally:
+                    for future in pending:
+                        future.cancel()
+            known_chunk_size.update(call)
+            return call.get_results()
+
+        return auto_retry_range_wrap
+
+
+__all__ = ["auto_retry_range", "should_split"]
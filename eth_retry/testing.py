@@ -0,0 +1,361 @@
+"""
+Fault-injecting JSON-RPC and block explorer stub servers.
+
+These let you exercise eth_retry against real sockets entirely offline. Each request is
+answered with a successful response or with one of the configured faults, chosen at random
+according to the rates in :class:`Faults`:
+
+- a known provider error message (see :data:`eth_retry.eth_retry.RETRY_ON_ERRS`)
+- 429 Too Many Requests with a ``Retry-After`` header
+- 403 Forbidden / 404 Not Found
+- a hang, where the connection is held open without a response
+- a connection reset
+
+POST requests are answered JSON-RPC style, GET requests are answered block explorer style.
+
+Usage::
+
+    from eth_retry.testing import Faults, StubServer
+
+    with StubServer(Faults(rate_limit=0.2, seed=0)) as server:
+        requests.post(server.url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId"})
+        assert server.request_count == 1
+"""
+
+import asyncio
+import json
+import socket
+import struct
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from types import TracebackType
+from typing import Any, Final, Literal, NamedTuple
+
+from eth_retry.eth_retry import RETRY_ON_ERRS
+
+__all__ = ["AsyncStubServer", "Faults", "StubServer"]
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Per-request fault rates for a stub server. Each rate is a probability in [0, 1]."""
+
+    # Maps an error message to the rate at which it is returned in the response body.
+    errors: Mapping[str, float] = field(default_factory=dict)
+    # Rate of 429 responses.
+    rate_limit: float = 0.0
+    # The ``Retry-After`` header value, in seconds, sent with 429 responses.
+    retry_after: int = 1
+    # Rate of 403 responses.
+    forbidden: float = 0.0
+    # Rate of 404 responses.
+    not_found: float = 0.0
+    # Rate of requests that get no response for ``hang_time`` seconds before the connection closes.
+    hang: float = 0.0
+    hang_time: float = 30.0
+    # Rate of requests answered by resetting the connection.
+    reset: float = 0.0
+    # Seconds to wait before answering every request that is not hung or reset.
+    latency: float = 0.0
+    # Seed for the fault rng, for reproducible runs.
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        rates = [self.rate_limit, self.forbidden, self.not_found, self.hang, self.reset]
+        rates.extend(self.errors.values())
+        if any(rate < 0 for rate in rates):
+            raise ValueError("fault rates must not be negative")
+        if sum(rates) > 1:
+            raise ValueError(f"fault rates must sum to at most 1, not {sum(rates)}")
+
+    @classmethod
+    def all_errors(cls, rate: float, **kwargs: Any) -> "Faults":
+        """Return every known transient error message at ``rate / len(RETRY_ON_ERRS)`` each."""
+        each = rate / len(RETRY_ON_ERRS)
+        return cls(errors={msg: each for msg in RETRY_ON_ERRS}, **kwargs)
+
+
+class _Response(NamedTuple):
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+_Outcome = _Response | Literal["hang", "reset"]
+
+_REASONS: Final = {200: "OK", 403: "Forbidden", 404: "Not Found", 429: "Too Many Requests"}
+
+
+def _json_response(payload: Any) -> _Response:
+    return _Response(200, {"Content-Type": "application/json"}, json.dumps(payload).encode())
+
+
+def _text_response(status: int, headers: dict[str, str] | None = None) -> _Response:
+    return _Response(
+        status, {"Content-Type": "text/plain", **(headers or {})}, _REASONS[status].encode()
+    )
+
+
+def _rpc_result(payload: Any, error: str | None) -> Any:
+    if isinstance(payload, list):
+        return [_rpc_result(p, error) for p in payload]
+    request_id = payload.get("id", 1) if isinstance(payload, dict) else None
+    if error is not None:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32000, "message": error}}
+    method = payload.get("method") if isinstance(payload, dict) else None
+    result = "StubServer/0.0.0" if method == "web3_clientVersion" else "0x1"
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _set_linger_zero(sock: Any) -> None:
+    # Closing a socket with SO_LINGER set to 0 sends RST instead of FIN.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+
+
+class _StubServerBase:
+    def __init__(
+        self, faults: Faults | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.faults: Final = faults or Faults()
+        self.host = host
+        self.port = port
+        self._counts: Counter[str] = Counter()
+        self._rng = Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._choices: Final = [
+            ("reset", self.faults.reset),
+            ("hang", self.faults.hang),
+            ("rate_limit", self.faults.rate_limit),
+            ("forbidden", self.faults.forbidden),
+            ("not_found", self.faults.not_found),
+            *self.faults.errors.items(),
+        ]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def counts(self) -> Counter[str]:
+        """
+        A copy of the requests served so far, keyed by outcome: "ok", "rate_limit",
+        "forbidden", "not_found", "hang", "reset" or the error message.
+        """
+        with self._lock:
+            return self._counts.copy()
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return self._counts.total()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def _choose(self) -> str:
+        with self._lock:
+            roll = self._rng.random()
+            cumulative = 0.0
+            for outcome, rate in self._choices:
+                cumulative += rate
+                if roll < cumulative:
+                    break
+            else:
+                outcome = "ok"
+            self._counts[outcome] += 1
+        return outcome
+
+    def _dispatch(self, method: str, body: bytes) -> _Outcome:
+        outcome = self._choose()
+        if outcome in ("hang", "reset"):
+            return outcome  # type: ignore [return-value]
+        if outcome == "rate_limit":
+            return _text_response(429, {"Retry-After": str(self.faults.retry_after)})
+        if outcome == "forbidden":
+            return _text_response(403)
+        if outcome == "not_found":
+            return _text_response(404)
+
+        error = None if outcome == "ok" else outcome
+        if method == "GET":
+            # block explorer style
+            if error is None:
+                return _json_response({"status": "1", "message": "OK", "result": "0x1"})
+            return _json_response({"status": "0", "message": "NOTOK", "result": error})
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = {}
+        return _json_response(_rpc_result(payload, error))
+
+
+class StubServer(_StubServerBase):
+    """A threaded stub server for use from synchronous code. Use as a context manager."""
+
+    def __init__(
+        self, faults: Faults | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        super().__init__(faults, host, port)
+        self._closing = threading.Event()
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                self._handle()
+
+            def do_POST(self) -> None:
+                self._handle()
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                outcome = stub._dispatch(self.command, body)
+                if outcome == "reset":
+                    _set_linger_zero(self.connection)
+                    self.connection.close()
+                    self.close_connection = True
+                    return
+                if outcome == "hang":
+                    stub._closing.wait(stub.faults.hang_time)
+                    self.close_connection = True
+                    return
+                if stub.faults.latency:
+                    stub._closing.wait(stub.faults.latency)
+                status, headers, payload = outcome
+                self.send_response(status, _REASONS[status])
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._closing.clear()
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._closing.set()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubServer":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+
+class AsyncStubServer(_StubServerBase):
+    """An asyncio stub server, served on the running event loop. Use as an async context manager."""
+
+    def __init__(
+        self, faults: Faults | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        super().__init__(faults, host, port)
+        self._closing: asyncio.Event | None = None
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self._closing = asyncio.Event()
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._closing is not None:
+            self._closing.set()
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "AsyncStubServer":
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    async def _wait_closing(self, timeout: float) -> None:
+        assert self._closing is not None
+        try:
+            await asyncio.wait_for(self._closing.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    return
+                method = request_line.decode("latin-1").split(" ", 1)[0]
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                outcome = self._dispatch(method, body)
+                if outcome == "reset":
+                    _set_linger_zero(writer.get_extra_info("socket"))
+                    writer.transport.abort()
+                    return
+                if outcome == "hang":
+                    await self._wait_closing(self.faults.hang_time)
+                    return
+                if self.faults.latency:
+                    await self._wait_closing(self.faults.latency)
+                status, response_headers, payload = outcome
+                head = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+                head.extend(f"{key}: {value}" for key, value in response_headers.items())
+                head.append(f"Content-Length: {len(payload)}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
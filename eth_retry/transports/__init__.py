@@ -0,0 +1,84 @@
+"""
+Transport-level integrations that apply eth_retry's classification and backoff to each HTTP
+request, rather than re-executing a whole decorated function:
+
+- :mod:`eth_retry.transports.requests`: a :class:`requests.adapters.HTTPAdapter`
+- :mod:`eth_retry.transports.aiohttp`: an :class:`aiohttp.ClientSession` middleware
+- :mod:`eth_retry.transports.web3`: a web3.py v7 provider middleware
+
+Each submodule only imports the library it integrates with.
+"""
+
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from math import isfinite
+from time import monotonic
+from typing import Any
+
+
+def is_transient_status(status: int) -> bool:
+    """Return True for HTTP statuses worth retrying: 429 Too Many Requests and any 5xx.
+
+    Other 4xx statuses won't change by asking again, so they're returned to the caller as is.
+    """
+    return status == 429 or status >= 500
+
+
+class RetryAfter:
+    """
+    Holds back the next attempt at a request until the time a 429's `Retry-After` asked for,
+    but never more than `max_delay` seconds.
+    """
+
+    def __init__(self, max_delay: float) -> None:
+        self.max_delay = max_delay
+        self._deadline = 0.0
+
+    def update(self, value: str | None) -> None:
+        """
+        Set the deadline from a `Retry-After` header value, in seconds or as an HTTP date.
+        Values that can't be parsed, or aren't finite, are ignored.
+        """
+        if not value:
+            return
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                date = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return
+            if date.tzinfo is None:
+                # A "-0000" zone parses to a naive datetime, the date is still in UTC.
+                date = date.replace(tzinfo=timezone.utc)
+            seconds = (date - datetime.now(timezone.utc)).total_seconds()
+        if not isfinite(seconds):
+            return
+        self._deadline = monotonic() + min(max(seconds, 0.0), self.max_delay)
+
+    def remaining(self) -> float:
+        """Return the seconds left to wait, after whatever backoff `auto_retry` already slept."""
+        return max(0.0, self._deadline - monotonic())
+
+
+class RPCError(ValueError):
+    """A JSON-RPC error response. Its message is the error object, just like web3.py's."""
+
+    def __init__(self, error: Any, response: Any) -> None:
+        super().__init__(error)
+        self.response = response
+
+
+def raise_for_rpc_error(content: bytes, response: Any) -> None:
+    """Raise :class:`RPCError` for the first JSON-RPC error in `content`, if there is one."""
+    # Skip the decode for the common case. Results can be many MBs of logs.
+    if b'"error"' not in content:
+        return
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return
+    for item in payload if isinstance(payload, list) else [payload]:
+        if isinstance(item, dict) and item.get("error"):
+            raise RPCError(item["error"], response)
@@ -0,0 +1,87 @@
+from asyncio import sleep as aiosleep
+from collections.abc import Awaitable, Callable
+
+from aiohttp import ClientRequest, ClientResponse, ClientResponseError
+
+from eth_retry.eth_retry import (
+    MAX_RETRIES,
+    MAX_SLEEP_TIME,
+    MIN_SLEEP_TIME,
+    SUPPRESS_LOGS,
+    auto_retry,
+)
+from eth_retry.transports import RPCError, RetryAfter, is_transient_status, raise_for_rpc_error
+
+# Types
+Handler = Callable[[ClientRequest], Awaitable[ClientResponse]]
+Middleware = Callable[[ClientRequest, Handler], Awaitable[ClientResponse]]
+
+
+class _ClientResponseError(ClientResponseError):
+    def __init__(self, response: ClientResponse) -> None:
+        super().__init__(
+            response.request_info,
+            response.history,
+            status=response.status,
+            message=response.reason or "",
+            headers=response.headers,
+        )
+        self.response = response
+
+
+def retry_middleware(
+    *,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> Middleware:
+    """
+    Return an :class:`aiohttp.ClientSession` middleware (aiohttp>=3.12) that retries each
+    request on the same transient errors as :func:`eth_retry.auto_retry`, with the same backoff::
+
+        aiohttp.ClientSession(middlewares=(retry_middleware(),))
+
+    429 and 5xx responses, and JSON-RPC error responses, are classified like the exceptions they
+    would raise, and a 429's `Retry-After` is honored, up to `max_sleep_time * max_retries`
+    seconds. Other 4xx responses are returned right away. If a response isn't retryable, or
+    retries run out, it's returned as usual. Connection errors are raised once retries run out.
+    """
+
+    async def _attempt(
+        request: ClientRequest, handler: Handler, retry_after: RetryAfter
+    ) -> ClientResponse:
+        if delay := retry_after.remaining():
+            await aiosleep(delay)
+        response = await handler(request)
+        if is_transient_status(response.status):
+            # reads the body so the connection goes back to the pool before we retry
+            await response.read()
+            if response.status == 429:
+                retry_after.update(response.headers.get("Retry-After"))
+            raise _ClientResponseError(response)
+        # Other responses are left unread unless they may hold a JSON-RPC error, so streaming
+        # and large downloads through the same session aren't buffered.
+        if response.status < 400 and response.content_type == "application/json":
+            raise_for_rpc_error(await response.read(), response)
+        return response
+
+    max_retry_after = max_sleep_time * max_retries
+    attempt = auto_retry(
+        _attempt,
+        max_retries=max_retries,
+        min_sleep_time=min_sleep_time,
+        max_sleep_time=max_sleep_time,
+        suppress_logs=suppress_logs,
+    )
+
+    async def eth_retry_middleware(request: ClientRequest, handler: Handler) -> ClientResponse:
+        try:
+            return await attempt(request, handler, RetryAfter(max_retry_after))
+        except (_ClientResponseError, RPCError) as e:
+            return e.response
+
+    return eth_retry_middleware
+
+
+__all__ = ["retry_middleware"]
@@ -0,0 +1,84 @@
+from time import sleep as timesleep
+from typing import Any
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError
+
+from eth_retry.eth_retry import (
+    MAX_RETRIES,
+    MAX_SLEEP_TIME,
+    MIN_SLEEP_TIME,
+    SUPPRESS_LOGS,
+    auto_retry,
+)
+from eth_retry.transports import RPCError, RetryAfter, is_transient_status, raise_for_rpc_error
+
+
+class RetryAdapter(HTTPAdapter):
+    """
+    A :class:`requests.adapters.HTTPAdapter` that retries each request on the same transient
+    errors as :func:`eth_retry.auto_retry`, with the same backoff.
+
+    429 and 5xx responses, and JSON-RPC error responses, are classified like the exceptions they
+    would raise, and a 429's `Retry-After` is honored, up to `max_sleep_time * max_retries`
+    seconds. Other 4xx responses are returned right away. If a response isn't retryable, or
+    retries run out, it's returned as usual. Connection errors are raised once retries run out.
+
+    Any extra keyword arguments are passed to :class:`~requests.adapters.HTTPAdapter`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = MAX_RETRIES,
+        min_sleep_time: int = MIN_SLEEP_TIME,
+        max_sleep_time: int = MAX_SLEEP_TIME,
+        suppress_logs: int = SUPPRESS_LOGS,
+        **kwargs: Any,
+    ) -> None:
+        # NOTE: HTTPAdapter's own `max_retries` is urllib3's, we leave it at its default.
+        super().__init__(**kwargs)
+        self._max_retry_after = max_sleep_time * max_retries
+        self._send_with_retries = auto_retry(
+            self._attempt,
+            max_retries=max_retries,
+            min_sleep_time=min_sleep_time,
+            max_sleep_time=max_sleep_time,
+            suppress_logs=suppress_logs,
+        )
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore [override]
+        try:
+            return self._send_with_retries(request, RetryAfter(self._max_retry_after), **kwargs)
+        except (HTTPError, RPCError) as e:
+            if e.response is None:
+                raise
+            return e.response
+
+    def _attempt(
+        self, request: PreparedRequest, retry_after: RetryAfter, **kwargs: Any
+    ) -> Response:
+        if delay := retry_after.remaining():
+            timesleep(delay)
+        response = super().send(request, **kwargs)
+        if is_transient_status(response.status_code):
+            # reads the body so the connection goes back to the pool before we retry
+            response.content
+            if response.status_code == 429:
+                retry_after.update(response.headers.get("Retry-After"))
+            response.raise_for_status()
+        elif response.status_code < 400 and not kwargs.get("stream"):
+            raise_for_rpc_error(response.content, response)
+        return response
+
+
+def mount_retry_adapter(session: Session, **kwargs: Any) -> RetryAdapter:
+    """Mount a :class:`RetryAdapter` on `session` for http and https urls and return it."""
+    adapter = RetryAdapter(**kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+__all__ = ["RetryAdapter", "mount_retry_adapter"]
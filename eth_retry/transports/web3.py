@@ -0,0 +1,101 @@
+from typing import Any
+
+from web3.middleware.base import Web3Middleware
+from web3.types import AsyncMakeRequestFn, MakeRequestFn, RPCEndpoint, RPCResponse
+
+from eth_retry.eth_retry import (
+    MAX_RETRIES,
+    MAX_SLEEP_TIME,
+    MIN_SLEEP_TIME,
+    SUPPRESS_LOGS,
+    auto_retry,
+)
+from eth_retry.transports import RPCError
+
+
+def _raise_for_rpc_error(response: RPCResponse) -> RPCResponse:
+    if "error" in response:
+        raise RPCError(response["error"], response)
+    return response
+
+
+class RetryMiddleware(Web3Middleware):
+    """
+    A web3.py v7 middleware that retries each RPC request on the same transient errors as
+    :func:`eth_retry.auto_retry`, with the same backoff. Works with sync and async providers::
+
+        w3.middleware_onion.add(RetryMiddleware)
+
+    Use :func:`construct_retry_middleware` to change the retry policy.
+
+    Error responses that aren't retryable, or still fail once retries run out, are returned as
+    usual so web3.py can raise them.
+    """
+
+    max_retries: int = MAX_RETRIES
+    min_sleep_time: int = MIN_SLEEP_TIME
+    max_sleep_time: int = MAX_SLEEP_TIME
+    suppress_logs: int = SUPPRESS_LOGS
+
+    def wrap_make_request(self, make_request: MakeRequestFn) -> MakeRequestFn:
+        def _attempt(method: RPCEndpoint, params: Any) -> RPCResponse:
+            return _raise_for_rpc_error(make_request(method, params))
+
+        attempt = auto_retry(
+            _attempt,
+            max_retries=self.max_retries,
+            min_sleep_time=self.min_sleep_time,
+            max_sleep_time=self.max_sleep_time,
+            suppress_logs=self.suppress_logs,
+        )
+
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            try:
+                return attempt(method, params)
+            except RPCError as e:
+                return e.response  # type: ignore [no-any-return]
+
+        return middleware
+
+    async def async_wrap_make_request(self, make_request: AsyncMakeRequestFn) -> AsyncMakeRequestFn:
+        async def _attempt(method: RPCEndpoint, params: Any) -> RPCResponse:
+            return _raise_for_rpc_error(await make_request(method, params))
+
+        attempt = auto_retry(
+            _attempt,
+            max_retries=self.max_retries,
+            min_sleep_time=self.min_sleep_time,
+            max_sleep_time=self.max_sleep_time,
+            suppress_logs=self.suppress_logs,
+        )
+
+        async def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            try:
+                return await attempt(method, params)
+            except RPCError as e:
+                return e.response  # type: ignore [no-any-return]
+
+        return middleware
+
+
+def construct_retry_middleware(
+    *,
+    max_retries: int = MAX_RETRIES,
+    min_sleep_time: int = MIN_SLEEP_TIME,
+    max_sleep_time: int = MAX_SLEEP_TIME,
+    suppress_logs: int = SUPPRESS_LOGS,
+) -> type[RetryMiddleware]:
+    """Return a :class:`RetryMiddleware` with the given retry policy, to add to a web3 instance."""
+    return type(
+        "RetryMiddleware",
+        (RetryMiddleware,),
+        dict(
+            max_retries=max_retries,
+            min_sleep_time=min_sleep_time,
+            max_sleep_time=max_sleep_time,
+            suppress_logs=suppress_logs,
+        ),
+    )
+
+
+__all__ = ["RetryMiddleware", "construct_retry_middleware"]
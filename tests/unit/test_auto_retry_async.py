@@ -47,3 +47,23 @@ def test_auto_retry_respects_max_retries_async(monkeypatch):
         asyncio.run(wrapped())
     assert attempts["count"] == 3
     assert sleeps == []
+
+
+def test_auto_retry_asyncio_timeout_logs_caller(monkeypatch, caplog):
+    attempts = {"count": 0}
+
+    async def flaky():
+        attempts["count"] += 1
+        if attempts["count"] == 1:
+            raise asyncio.TimeoutError("timeout")
+        return "ok"
+
+    wrapped = er.auto_retry(max_retries=1)(flaky)
+
+    async def caller():
+        return await wrapped()
+
+    with caplog.at_level("WARNING", logger="eth_retry"):
+        assert asyncio.run(caller()) == "ok"
+    assert "asyncio timeout [0]" in caplog.text
+    assert "test_auto_retry_async.py" in caplog.text
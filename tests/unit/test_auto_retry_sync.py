@@ -60,3 +60,23 @@ def test_auto_retry_rejects_async_generator():
 
     with pytest.raises(ValueError, match="async gen function not supported"):
         er.auto_retry(gen)
+
+
+def test_auto_retry_debug_logs_traceback(reload_eth_retry, monkeypatch, caplog):
+    module = reload_eth_retry(ETH_RETRY_DEBUG="1")
+    attempts = {"count": 0}
+
+    def flaky():
+        attempts["count"] += 1
+        if attempts["count"] == 1:
+            raise ConnectionError("temporary failure in name resolution")
+        return "ok"
+
+    monkeypatch.setattr(module, "randrange", lambda *_: 0)
+    monkeypatch.setattr(module, "timesleep", lambda *_: None)
+
+    wrapped = module.auto_retry(max_retries=1, min_sleep_time=0, max_sleep_time=1)(flaky)
+    with caplog.at_level("INFO", logger="eth_retry"):
+        assert wrapped() == "ok"
+    assert "Traceback" in caplog.text
+    assert "ConnectionError: temporary failure in name resolution" in caplog.text
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import eth_retry.eth_retry as er
+from eth_retry.bulk import bulk_map, bulk_map_async
+
+
+def _square(item):
+    if item == 3:
+        raise ValueError("no retry")
+    return item * item
+
+
+def test_bulk_map_ordered_collects_failures():
+    results = list(bulk_map(_square, range(6), max_workers=3))
+    assert [item for item, _ in results] == list(range(6))
+    assert [r for i, r in results if i != 3] == [0, 1, 4, 16, 25]
+    assert isinstance(results[3][1], ValueError)
+
+
+def test_bulk_map_unordered():
+    def slow_first(item):
+        if item == 0:
+            time.sleep(0.05)
+        return item
+
+    results = list(bulk_map(slow_first, range(5), max_workers=5, ordered=False))
+    assert sorted(results) == [(i, i) for i in range(5)]
+    assert results[-1] == (0, 0)
+
+
+def test_bulk_map_bounds_in_flight():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work(item):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.001)
+        with lock:
+            active -= 1
+        return item
+
+    assert [r for _, r in bulk_map(work, range(50), max_workers=4)] == list(range(50))
+    assert peak <= 4
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_bulk_map_throttles_submissions_while_an_item_backs_off(monkeypatch):
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    events, yielded, active_at_start = [], [], []
+    attempts = {}
+    active = 0
+    backing_off = threading.Event()
+    lock = threading.Lock()
+
+    def fake_sleep(seconds):
+        events.append("sleep")
+        backing_off.set()
+        # The rest of the batch carries on, and is yielded, while item 0 backs off.
+        _wait_for(lambda: len(yielded) >= 10)
+        backing_off.clear()
+        events.append("wake")
+
+    monkeypatch.setattr(er, "timesleep", fake_sleep)
+
+    @er.auto_retry(max_retries=2, min_sleep_time=0, max_sleep_time=1)
+    def flaky(item):
+        nonlocal active
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 0 and attempts[item] == 1:
+            _wait_for(lambda: len(attempts) >= 4)
+            raise ConnectionError("temporary failure in name resolution")
+        with lock:
+            active += 1
+            if backing_off.is_set():
+                active_at_start.append(active)
+        time.sleep(0.002)
+        with lock:
+            active -= 1
+        return item
+
+    for item, result in bulk_map(flaky, range(20), max_workers=4, ordered=False):
+        yielded.append(item)
+        events.append(f"yield {item}")
+
+    assert sorted(yielded) == list(range(20))
+    assert attempts[0] == 2
+    # 10 items were yielded before item 0 woke up, and the items started meanwhile ran
+    # alongside at most one other, instead of the 3 the pool has threads for.
+    assert events.index("wake") > events.index("sleep") + 10
+    assert len(active_at_start) >= 6
+    assert max(active_at_start) <= 2
+
+
+def test_bulk_map_ordered_keeps_working_past_a_slow_item(monkeypatch):
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    done = []
+
+    def fake_sleep(seconds):
+        _wait_for(lambda: len(done) >= 15)
+
+    monkeypatch.setattr(er, "timesleep", fake_sleep)
+    attempts = {}
+
+    @er.auto_retry(max_retries=2, min_sleep_time=0, max_sleep_time=1)
+    def flaky(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 0 and attempts[item] == 1:
+            raise ConnectionError("temporary failure in name resolution")
+        done.append(item)
+        return item
+
+    results = list(bulk_map(flaky, range(20), max_workers=4))
+    assert results == [(i, i) for i in range(20)]
+    # every other item finished while item 0 was backing off
+    assert done.index(0) >= 15
+
+
+def test_bulk_map_type_error():
+    with pytest.raises(TypeError):
+        bulk_map(_square, [], max_workers=0)
+
+
+def test_bulk_map_async():
+    active, peak = 0, 0
+
+    async def work(item):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001 * (item % 3))
+        active -= 1
+        return _square(item)
+
+    async def main(ordered):
+        return [r async for r in bulk_map_async(work, range(20), concurrency=4, ordered=ordered)]
+
+    results = asyncio.run(main(True))
+    assert [item for item, _ in results] == list(range(20))
+    assert isinstance(results[3][1], ValueError)
+    assert results[4] == (4, 16)
+    assert peak <= 4
+
+    assert sorted(item for item, _ in asyncio.run(main(False))) == list(range(20))
+
+
+def test_bulk_map_async_throttles_submissions_while_an_item_backs_off(monkeypatch):
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    events, yielded, active_at_start = [], [], []
+    attempts = {}
+    active = 0
+    backing_off = False
+
+    async def fake_sleep(seconds):
+        nonlocal backing_off
+        events.append("sleep")
+        backing_off = True
+        deadline = time.monotonic() + 5
+        while len(yielded) < 10 and time.monotonic() < deadline:
+            await asyncio.sleep(0.001)
+        backing_off = False
+        events.append("wake")
+
+    monkeypatch.setattr(er, "aiosleep", fake_sleep)
+
+    @er.auto_retry(max_retries=2, min_sleep_time=0, max_sleep_time=1)
+    async def flaky(item):
+        nonlocal active
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 0 and attempts[item] == 1:
+            deadline = time.monotonic() + 5
+            while len(attempts) < 4 and time.monotonic() < deadline:
+                await asyncio.sleep(0.001)
+            raise ConnectionError("temporary failure in name resolution")
+        active += 1
+        if backing_off:
+            active_at_start.append(active)
+        await asyncio.sleep(0.002)
+        active -= 1
+        return item
+
+    async def main():
+        async for item, result in bulk_map_async(flaky, range(20), concurrency=4, ordered=False):
+            yielded.append(item)
+            events.append(f"yield {item}")
+
+    asyncio.run(main())
+    assert sorted(yielded) == list(range(20))
+    assert attempts[0] == 2
+    assert events.index("wake") > events.index("sleep") + 10
+    assert len(active_at_start) >= 6
+    assert max(active_at_start) <= 2
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+# Microseconds eth_retry may spend importing on top of the stdlib modules it depends on.
+IMPORT_BUDGET_US = 50_000
+
+_STDLIB_DEPS = "asyncio, functools, inspect, json, logging, random, time, typing"
+
+
+def _import_eth_retry(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {_STDLIB_DEPS}\n{code}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_import_does_not_load_http_libraries():
+    result = _import_eth_retry(
+        "import sys, eth_retry\n"
+        "print(*(m for m in ('requests', 'aiohttp', 'urllib3', 'sqlite3') if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_budget():
+    result = _import_eth_retry("import eth_retry")
+    for line in result.stderr.splitlines():
+        _, cumulative_us, name = line.split("|")
+        if name.strip() == "eth_retry":
+            assert int(cumulative_us) < IMPORT_BUDGET_US
+            return
+    raise AssertionError(f"eth_retry not found in import times:\n{result.stderr}")
@@ -0,0 +1,57 @@
+import asyncio
+import timeit
+
+import eth_retry.eth_retry as er
+
+# How much slower than a bare `*args, **kwargs` pass-through each wrapper may be on success.
+SYNC_OVERHEAD_BUDGET = 2.0
+ASYNC_OVERHEAD_BUDGET = 2.0
+
+
+def _func(x):
+    return x
+
+
+async def _coro_func(x):
+    return x
+
+
+def _passthrough(*args, **kwargs):
+    return _func(*args, **kwargs)
+
+
+async def _coro_passthrough(*args, **kwargs):
+    return await _coro_func(*args, **kwargs)
+
+
+def _run(coro):
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise AssertionError("coroutine suspended")
+
+
+def _time(fn):
+    return min(timeit.repeat(fn, number=20_000, repeat=7))
+
+
+def test_sync_wrapper_overhead():
+    wrapped = er.auto_retry(_func)
+    assert wrapped(1) == 1
+    ratio = _time(lambda: wrapped(1)) / _time(lambda: _passthrough(1))
+    assert ratio < SYNC_OVERHEAD_BUDGET
+
+
+def test_async_wrapper_overhead():
+    wrapped = er.auto_retry(_coro_func)
+    assert asyncio.run(wrapped(1)) == 1
+    ratio = _time(lambda: _run(wrapped(1))) / _time(lambda: _run(_coro_passthrough(1)))
+    assert ratio < ASYNC_OVERHEAD_BUDGET
+
+
+def test_disabled_does_not_wrap(reload_eth_retry):
+    module = reload_eth_retry(ETH_RETRY_DISABLED="1")
+    assert module.auto_retry(_func) is _func
+    assert module.auto_retry(_coro_func) is _coro_func
+    assert module.auto_retry(max_retries=3)(_func) is _func
@@ -0,0 +1,216 @@
+import asyncio
+import threading
+
+import pytest
+import requests
+
+import eth_retry.eth_retry as er
+from eth_retry.ranges import auto_retry_range, should_split
+
+_LIMIT = 10
+
+
+def _no_sleep(monkeypatch):
+    async def no_sleep_async(*_):
+        pass
+
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    monkeypatch.setattr(er, "timesleep", lambda *_: None)
+    monkeypatch.setattr(er, "aiosleep", no_sleep_async)
+
+
+def _get_logs(calls, from_block, to_block):
+    calls.append((from_block, to_block))
+    if to_block - from_block + 1 > _LIMIT:
+        raise ValueError("query returned more than 10000 results")
+    return list(range(from_block, to_block + 1))
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        ValueError("execution aborted (timeout = 10s)"),
+        ValueError("Log response size exceeded."),
+        requests.HTTPError("413 Client Error: Request Entity Too Large"),
+        requests.ReadTimeout("read timed out"),
+        asyncio.TimeoutError(),
+    ],
+)
+def test_should_split(exc):
+    assert should_split(exc) is True
+
+
+def test_should_not_split():
+    assert should_split(ValueError("max rate limit reached")) is False
+    assert should_split(ConnectionError("connection")) is False
+
+
+def test_auto_retry_range_bisects_and_remembers_chunk_size():
+    calls = []
+    get_logs = auto_retry_range(max_concurrency=4)(lambda a, b: _get_logs(calls, a, b))
+
+    assert get_logs(0, 99) == list(range(100))
+    assert (0, 99) in calls
+
+    calls.clear()
+    assert get_logs(100, 149) == list(range(100, 150))
+    assert calls and all(b - a + 1 <= _LIMIT for a, b in calls)
+
+
+def test_auto_retry_range_bounds_concurrency():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    @auto_retry_range(max_concurrency=3, chunk_size=1)
+    def get_logs(from_block, to_block):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        threading.Event().wait(0.01)
+        with lock:
+            active -= 1
+        return [from_block]
+
+    assert get_logs(0, 19) == list(range(20))
+    assert peak <= 3
+
+
+def test_auto_retry_range_retries_transient_errors(monkeypatch):
+    _no_sleep(monkeypatch)
+    calls = []
+
+    @auto_retry_range(max_retries=2)
+    def get_logs(from_block, to_block):
+        calls.append((from_block, to_block))
+        if len(calls) == 1:
+            raise ConnectionError("temporary failure in name resolution")
+        return [from_block]
+
+    assert get_logs(5, 9) == [5]
+    assert calls == [(5, 9), (5, 9)]
+
+
+def test_auto_retry_range_raises_when_single_block_too_large():
+    @auto_retry_range
+    def get_logs(from_block, to_block):
+        raise ValueError("response size exceeded")
+
+    with pytest.raises(ValueError, match="response size exceeded"):
+        get_logs(0, 3)
+
+
+def test_auto_retry_range_non_retryable_error_bubbles():
+    @auto_retry_range
+    def get_logs(from_block, to_block):
+        raise KeyError("nope")
+
+    with pytest.raises(KeyError):
+        get_logs(0, 3)
+
+
+def test_auto_retry_range_async():
+    calls = []
+    active, peak = 0, 0
+
+    @auto_retry_range(max_concurrency=2)
+    async def get_logs(from_block, to_block):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return _get_logs(calls, from_block, to_block)
+
+    assert asyncio.run(get_logs(0, 99)) == list(range(100))
+    assert peak <= 2
+
+    calls.clear()
+    assert asyncio.run(get_logs(0, 19)) == list(range(20))
+    assert all(b - a + 1 <= _LIMIT for a, b in calls)
+
+
+def test_auto_retry_range_type_errors():
+    with pytest.raises(TypeError):
+        auto_retry_range(max_concurrency=0)
+    with pytest.raises(TypeError):
+        auto_retry_range(chunk_size="10")
+
+
+@pytest.mark.parametrize(
+    "exc", [asyncio.TimeoutError(), ValueError("execution aborted (timeout = 5s)")]
+)
+def test_auto_retry_range_retries_single_block_timeouts(monkeypatch, exc):
+    _no_sleep(monkeypatch)
+    calls = []
+
+    @auto_retry_range
+    def get_logs(from_block, to_block):
+        calls.append((from_block, to_block))
+        if len(calls) == 1:
+            raise exc
+        return [from_block]
+
+    @auto_retry_range
+    async def get_logs_async(from_block, to_block):
+        return get_logs.__wrapped__(from_block, to_block)
+
+    assert get_logs(5, 5) == [5]
+    assert calls == [(5, 5), (5, 5)]
+
+    calls.clear()
+    assert asyncio.run(get_logs_async(5, 5)) == [5]
+    assert calls == [(5, 5), (5, 5)]
+
+
+def test_auto_retry_range_timeouts_dont_shrink_chunk_size():
+    calls = []
+    timeouts = [asyncio.TimeoutError()]
+
+    @auto_retry_range
+    def get_logs(from_block, to_block):
+        calls.append((from_block, to_block))
+        if timeouts:
+            raise timeouts.pop()
+        return [from_block]
+
+    assert get_logs(0, 1) == [0, 1]
+    calls.clear()
+    assert get_logs(0, 999) == [0]
+    assert calls == [(0, 999)]
+
+
+def test_auto_retry_range_chunk_size_grows_back():
+    calls = []
+    get_logs = auto_retry_range(max_concurrency=4)(lambda a, b: _get_logs(calls, a, b))
+
+    sizes = []
+    for _ in range(10):
+        calls.clear()
+        assert get_logs(0, 99) == list(range(100))
+        sizes.append(max(b - a + 1 for a, b in calls))
+    # The first call bisects down from 100 blocks. After that, the size grows back towards the
+    # limit but never to a size that was already too large, and settles at the limit.
+    assert sizes[0] == 100
+    assert all(size <= 11 for size in sizes[1:])
+    assert sizes[1] < sizes[2] <= _LIMIT
+    assert sorted(calls) == [(start, start + 9) for start in range(0, 100, 10)]
+
+
+def test_auto_retry_range_chunk_size_is_a_ceiling():
+    calls = []
+    get_logs = auto_retry_range(chunk_size=_LIMIT)(lambda a, b: _get_logs(calls, a, b))
+
+    for _ in range(4):
+        calls.clear()
+        assert get_logs(0, 99) == list(range(100))
+        assert len(calls) == 10
+
+
+def test_auto_retry_range_empty_range():
+    calls = []
+    get_logs = auto_retry_range(lambda a, b: calls.append((a, b)) or [a])
+
+    assert get_logs(10, 9) == []
+    assert get_logs(10, 0) == []
+    assert calls == []
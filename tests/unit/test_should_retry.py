@@ -1,6 +1,9 @@
+import gc
+import weakref
 from json import JSONDecodeError
 
 import pytest
+import requests
 from aiohttp import RequestInfo
 from multidict import CIMultiDict, CIMultiDictProxy
 from yarl import URL
@@ -9,7 +12,7 @@ import eth_retry.eth_retry as er
 
 
 def _http_error(status_code, message):
-    response = er.requests.Response()
+    response = requests.Response()
     response.status_code = status_code
     return er.HTTPError(message, response=response)
 
@@ -48,7 +51,7 @@ def test_should_retry_string_matches(message):
     "exc",
     [
         ConnectionError("connection"),
-        er.requests.exceptions.ConnectionError("connection"),
+        requests.exceptions.ConnectionError("connection"),
         er.HTTPError("http error"),
         er.ReadTimeout("timeout"),
         er.MaxRetryError(None, "http://example.com", "retry"),
@@ -110,3 +113,12 @@ def test_should_retry_disabled(reload_eth_retry):
 
 def test_should_not_retry_unmatched_exception():
     assert er.should_retry(ValueError("nope"), failures=0, max_retries=3) is False
+
+
+def test_mro_names_cache_does_not_keep_types_alive():
+    typ = type("DynamicError", (ConnectionError,), {})
+    assert er.should_retry(typ("connection"), failures=0, max_retries=3) is True
+    ref = weakref.ref(typ)
+    del typ
+    gc.collect()
+    assert ref() is None
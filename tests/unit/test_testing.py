@@ -0,0 +1,151 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import pytest
+import requests
+
+import eth_retry.eth_retry as er
+from eth_retry.testing import AsyncStubServer, Faults, StubServer
+
+_PAYLOAD = {"jsonrpc": "2.0", "id": 7, "method": "eth_chainId", "params": []}
+_MESSAGE = "max rate limit reached"
+
+
+def _raise_for_rpc_error(response: requests.Response) -> str:
+    response.raise_for_status()
+    body = response.json()
+    if "error" in body:
+        raise ValueError(body["error"]["message"])
+    return body["result"]
+
+
+def test_faults_rejects_rates_over_one():
+    with pytest.raises(ValueError):
+        Faults(rate_limit=0.6, reset=0.6)
+
+
+def test_faults_all_errors_covers_known_messages():
+    faults = Faults.all_errors(0.5)
+    assert set(faults.errors) == set(er.RETRY_ON_ERRS)
+    assert sum(faults.errors.values()) == pytest.approx(0.5)
+
+
+def test_stub_server_ok():
+    with StubServer() as server:
+        response = requests.post(server.url, json=_PAYLOAD)
+        assert response.json() == {"jsonrpc": "2.0", "id": 7, "result": "0x1"}
+        assert server.request_count == 1
+        assert server.counts["ok"] == 1
+
+
+def test_stub_server_counts_under_concurrent_load():
+    messages = {f"{_MESSAGE} {i}": 0.01 for i in range(50)}
+    with StubServer(Faults(errors=messages, seed=3)) as server:
+
+        def post(_):
+            with requests.Session() as session:
+                for _ in range(20):
+                    session.post(server.url, json=_PAYLOAD)
+
+        with ThreadPoolExecutor(8) as executor:
+            futures = [executor.submit(post, i) for i in range(8)]
+            while not all(f.done() for f in futures):
+                assert server.request_count <= 160
+                assert sum(server.counts.values()) <= 160
+            for future in futures:
+                future.result()
+
+        assert server.request_count == 160
+        counts = server.counts
+        counts["ok"] += 1
+        assert server.counts["ok"] == counts["ok"] - 1
+
+
+def test_stub_server_error_message_is_retryable():
+    with StubServer(Faults(errors={_MESSAGE: 1.0})) as server:
+        with pytest.raises(ValueError) as exc_info:
+            _raise_for_rpc_error(requests.post(server.url, json=_PAYLOAD))
+        assert er.should_retry(exc_info.value, failures=0, max_retries=3) is True
+
+        explorer = requests.get(f"{server.url}/api?module=proxy").json()
+        assert explorer == {"status": "0", "message": "NOTOK", "result": _MESSAGE}
+        assert server.counts[_MESSAGE] == 2
+
+
+def test_stub_server_rate_limit_sends_retry_after():
+    with StubServer(Faults(rate_limit=1.0, retry_after=3)) as server:
+        response = requests.post(server.url, json=_PAYLOAD)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+
+
+def test_stub_server_forbidden_and_not_found_are_not_retryable():
+    for faults, status in ((Faults(forbidden=1.0), 403), (Faults(not_found=1.0), 404)):
+        with StubServer(faults) as server:
+            with pytest.raises(requests.HTTPError) as exc_info:
+                requests.post(server.url, json=_PAYLOAD).raise_for_status()
+            assert exc_info.value.response.status_code == status
+            assert er.should_retry(exc_info.value, failures=0, max_retries=3) is False
+
+
+def test_stub_server_reset():
+    with StubServer(Faults(reset=1.0)) as server:
+        with pytest.raises(requests.ConnectionError) as exc_info:
+            requests.post(server.url, json=_PAYLOAD)
+        assert er.should_retry(exc_info.value, failures=0, max_retries=3) is True
+        assert server.counts["reset"] == 1
+
+
+def test_stub_server_hang():
+    with StubServer(Faults(hang=1.0, hang_time=5)) as server:
+        with pytest.raises(requests.ReadTimeout):
+            requests.post(server.url, json=_PAYLOAD, timeout=0.2)
+
+
+def test_auto_retry_against_stub_server(monkeypatch):
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    faults = Faults.all_errors(0.3, reset=0.1, rate_limit=0.1, seed=1)
+
+    with StubServer(faults) as server, requests.Session() as session:
+
+        @er.auto_retry(max_retries=50, min_sleep_time=0, max_sleep_time=1)
+        def call() -> str:
+            return _raise_for_rpc_error(session.post(server.url, json=_PAYLOAD))
+
+        assert [call() for _ in range(50)] == ["0x1"] * 50
+        assert server.counts["ok"] == 50
+        assert server.request_count > 50
+
+
+def test_async_stub_server():
+    async def main():
+        faults = Faults(errors={_MESSAGE: 0.5}, forbidden=0.2, seed=2)
+        async with AsyncStubServer(faults) as server, aiohttp.ClientSession() as session:
+            statuses = []
+            for _ in range(20):
+                async with session.post(server.url, json=_PAYLOAD) as response:
+                    statuses.append(response.status)
+                    if response.status == 200:
+                        body = await response.json()
+                        assert body.get("result") == "0x1" or body["error"]["message"] == _MESSAGE
+            assert server.request_count == 20
+            assert statuses.count(403) == server.counts["forbidden"]
+
+    asyncio.run(main())
+
+
+def test_async_stub_server_reset_and_hang():
+    async def main():
+        async with AsyncStubServer(Faults(reset=1.0)) as server, aiohttp.ClientSession() as session:
+            with pytest.raises(aiohttp.ClientError) as exc_info:
+                await session.post(server.url, json=_PAYLOAD)
+            assert er.should_retry(exc_info.value, failures=0, max_retries=3) is True
+
+        async with AsyncStubServer(Faults(hang=1.0, hang_time=5)) as server:
+            timeout = aiohttp.ClientTimeout(total=0.2)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                with pytest.raises(asyncio.TimeoutError):
+                    await session.post(server.url, json=_PAYLOAD)
+
+    asyncio.run(main())
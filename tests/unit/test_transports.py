@@ -0,0 +1,290 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import aiohttp
+import pytest
+import requests
+from aiohttp import RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+import eth_retry.eth_retry as er
+import eth_retry.transports.aiohttp as transports_aiohttp
+import eth_retry.transports.requests as transports_requests
+from eth_retry.testing import AsyncStubServer, Faults, StubServer
+from eth_retry.transports import RetryAfter, RPCError, raise_for_rpc_error
+from eth_retry.transports.aiohttp import retry_middleware
+from eth_retry.transports.requests import mount_retry_adapter
+
+_PAYLOAD = {"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}
+_MESSAGE = "max rate limit reached"
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    async def no_sleep_async(*_):
+        pass
+
+    monkeypatch.setattr(er, "randrange", lambda *_: 0)
+    monkeypatch.setattr(er, "timesleep", lambda *_: None)
+    monkeypatch.setattr(er, "aiosleep", no_sleep_async)
+
+
+def test_raise_for_rpc_error():
+    raise_for_rpc_error(b'{"jsonrpc": "2.0", "id": 1, "result": "0x1"}', None)
+    with pytest.raises(RPCError, match=_MESSAGE):
+        raise_for_rpc_error(
+            b'[{"id": 1, "result": "0x1"}, {"error": "%s"}]' % _MESSAGE.encode(), None
+        )
+
+
+def test_requests_adapter_retries_each_request():
+    faults = Faults(errors={_MESSAGE: 0.3}, rate_limit=0.1, retry_after=0, reset=0.1, seed=3)
+    with StubServer(faults) as server, requests.Session() as session:
+        mount_retry_adapter(session, max_retries=50, min_sleep_time=0, max_sleep_time=1)
+        for _ in range(30):
+            response = session.post(server.url, json=_PAYLOAD)
+            assert response.json()["result"] == "0x1"
+        assert server.counts["ok"] == 30
+        assert server.request_count > 30
+
+
+def test_requests_adapter_returns_non_retryable_response():
+    with StubServer(Faults(forbidden=1.0)) as server, requests.Session() as session:
+        mount_retry_adapter(session)
+        assert session.post(server.url, json=_PAYLOAD).status_code == 403
+        assert server.request_count == 1
+
+
+def test_requests_adapter_returns_response_when_retries_run_out():
+    with StubServer(Faults(errors={_MESSAGE: 1.0})) as server, requests.Session() as session:
+        mount_retry_adapter(session, max_retries=1, min_sleep_time=0, max_sleep_time=1)
+        assert session.post(server.url, json=_PAYLOAD).json()["error"]["message"] == _MESSAGE
+        assert server.request_count == 3
+
+
+def test_requests_adapter_raises_connection_errors_when_retries_run_out():
+    with StubServer(Faults(reset=1.0)) as server, requests.Session() as session:
+        mount_retry_adapter(session, max_retries=1, min_sleep_time=0, max_sleep_time=1)
+        with pytest.raises(requests.ConnectionError):
+            session.post(server.url, json=_PAYLOAD)
+        assert server.request_count == 3
+
+
+def test_aiohttp_middleware_retries_each_request():
+    async def main():
+        faults = Faults(errors={_MESSAGE: 0.3}, rate_limit=0.1, retry_after=0, reset=0.1, seed=4)
+        middleware = retry_middleware(max_retries=50, min_sleep_time=0, max_sleep_time=1)
+        async with (
+            AsyncStubServer(faults) as server,
+            aiohttp.ClientSession(middlewares=(middleware,)) as session,
+        ):
+            for _ in range(30):
+                async with session.post(server.url, json=_PAYLOAD) as response:
+                    assert (await response.json())["result"] == "0x1"
+            assert server.counts["ok"] == 30
+            assert server.request_count > 30
+
+        async with (
+            AsyncStubServer(Faults(not_found=1.0)) as server,
+            aiohttp.ClientSession(middlewares=(middleware,)) as session,
+        ):
+            async with session.post(server.url, json=_PAYLOAD) as response:
+                assert response.status == 404
+            assert server.request_count == 1
+
+    asyncio.run(main())
+
+
+def _flaky_make_request(failures, error=_MESSAGE):
+    calls = []
+
+    def make_request(method, params):
+        calls.append(method)
+        if len(calls) <= failures:
+            return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": error}}
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+    return make_request, calls
+
+
+def _construct_web3_middleware(**policy):
+    # The middleware is built on the web3.py v7 middleware API.
+    pytest.importorskip("web3.middleware.base")
+    from eth_retry.transports.web3 import construct_retry_middleware
+
+    return construct_retry_middleware(**policy)
+
+
+def _web3_middleware(**policy):
+    return _construct_web3_middleware(**policy)(None)
+
+
+def test_web3_middleware():
+    make_request, calls = _flaky_make_request(2)
+    middleware = _web3_middleware(min_sleep_time=0, max_sleep_time=1)
+    assert middleware.wrap_make_request(make_request)("eth_chainId", [])["result"] == "0x1"
+    assert calls == ["eth_chainId"] * 3
+
+
+def test_web3_middleware_returns_non_retryable_error():
+    make_request, calls = _flaky_make_request(1, error="execution reverted")
+    middleware = _web3_middleware().wrap_make_request(make_request)
+    assert middleware("eth_call", [])["error"]["message"] == "execution reverted"
+    assert calls == ["eth_call"]
+
+
+def test_async_web3_middleware():
+    make_request, calls = _flaky_make_request(2)
+
+    async def async_make_request(method, params):
+        return make_request(method, params)
+
+    async def main():
+        middleware = _web3_middleware(min_sleep_time=0, max_sleep_time=1)
+        wrapped = await middleware.async_wrap_make_request(async_make_request)
+        return await wrapped("eth_chainId", [])
+
+    assert asyncio.run(main())["result"] == "0x1"
+    assert calls == ["eth_chainId"] * 3
+
+
+def test_web3_middleware_against_stub_server():
+    middleware = _construct_web3_middleware(min_sleep_time=0, max_sleep_time=1)
+    from web3 import HTTPProvider, Web3
+
+    with StubServer(Faults(errors={_MESSAGE: 0.5}, seed=0)) as server:
+        w3 = Web3(HTTPProvider(server.url))
+        w3.middleware_onion.add(middleware)
+        assert [w3.eth.chain_id for _ in range(10)] == [1] * 10
+        assert server.counts[_MESSAGE] > 0
+
+
+def _responses(monkeypatch, *statuses, retry_after=None):
+    calls = []
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = statuses[len(calls)]
+        response._content = b'{"jsonrpc": "2.0", "id": 1, "result": "0x1"}'
+        if retry_after is not None:
+            response.headers["Retry-After"] = retry_after
+        calls.append(response.status_code)
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    return calls
+
+
+@pytest.mark.parametrize("status", [400, 401, 405])
+def test_requests_adapter_returns_client_errors_right_away(monkeypatch, status):
+    calls = _responses(monkeypatch, status)
+    with requests.Session() as session:
+        mount_retry_adapter(session)
+        assert session.post("http://example.com", json=_PAYLOAD).status_code == status
+    assert calls == [status]
+
+
+def test_requests_adapter_retries_server_errors_and_honors_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(transports_requests, "timesleep", sleeps.append)
+    calls = _responses(monkeypatch, 503, 429, 200, retry_after="2")
+    with requests.Session() as session:
+        mount_retry_adapter(session, min_sleep_time=0, max_sleep_time=1)
+        assert session.post("http://example.com", json=_PAYLOAD).status_code == 200
+    assert calls == [503, 429, 200]
+    assert len(sleeps) == 1 and 1.5 < sleeps[0] <= 2
+
+
+def test_requests_adapter_handles_retry_after_dates_without_a_zone(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(transports_requests, "timesleep", sleeps.append)
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5)).replace(
+        "+0000", "-0000"
+    )
+    calls = _responses(monkeypatch, 429, 200, retry_after=date)
+    with requests.Session() as session:
+        mount_retry_adapter(session, min_sleep_time=0, max_sleep_time=1)
+        assert session.post("http://example.com", json=_PAYLOAD).status_code == 200
+    assert calls == [429, 200]
+    assert len(sleeps) == 1 and 3 < sleeps[0] <= 5
+
+
+@pytest.mark.parametrize(
+    "value, delay",
+    [
+        ("2", 2),
+        ("-5", 0),
+        ("1e9", 30),
+        ("inf", 0),
+        ("nan", 0),
+        ("soon", 0),
+        ("Mon, 01 Jan 2001 00:00:00 GMT", 0),
+        ("Fri, 31 Dec 9999 23:59:59 -0000", 30),
+    ],
+)
+def test_retry_after_clamps_delay(value, delay):
+    retry_after = RetryAfter(max_delay=30)
+    retry_after.update(value)
+    assert retry_after.remaining() == pytest.approx(delay, abs=0.5)
+
+
+class _FakeClientResponse:
+    def __init__(self, status, headers, content_type="application/json"):
+        self.status = status
+        self.headers = headers
+        self.content_type = content_type
+        self.reads = 0
+        self.reason = "reason"
+        self.request_info = RequestInfo(
+            URL("http://example.com"),
+            "POST",
+            CIMultiDictProxy(CIMultiDict()),
+            URL("http://example.com"),
+        )
+        self.history = ()
+
+    async def read(self):
+        self.reads += 1
+        return b'{"jsonrpc": "2.0", "id": 1, "result": "0x1"}'
+
+
+def test_aiohttp_middleware_statuses(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(transports_aiohttp, "aiosleep", fake_sleep)
+    middleware = retry_middleware(min_sleep_time=0, max_sleep_time=1)
+
+    async def run(*statuses):
+        calls = []
+
+        async def handler(request):
+            calls.append(statuses[len(calls)])
+            return _FakeClientResponse(calls[-1], {"Retry-After": "2"})
+
+        return (await middleware(None, handler)).status, calls
+
+    assert asyncio.run(run(401)) == (401, [401])
+    assert asyncio.run(run(500, 429, 200)) == (200, [500, 429, 200])
+    assert len(sleeps) == 1 and 1.5 < sleeps[0] <= 2
+
+
+def test_aiohttp_middleware_only_reads_transient_and_json_responses():
+    middleware = retry_middleware(min_sleep_time=0, max_sleep_time=1)
+
+    async def run(status, content_type):
+        response = _FakeClientResponse(status, {}, content_type)
+
+        async def handler(request):
+            return response
+
+        assert await middleware(None, handler) is response
+        return response.reads
+
+    assert asyncio.run(run(200, "application/json")) == 1
+    assert asyncio.run(run(200, "application/octet-stream")) == 0
+    assert asyncio.run(run(404, "application/json")) == 0